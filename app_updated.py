@@ -7,6 +7,9 @@ import geocoder
 from datetime import datetime
 import requests
 import json
+from detector import load_model
+from roi import load_roi, list_profiles
+from temporal import CONFIRM_M, CONFIRM_N, MIN_CONFIDENCE, TemporalConfirmer
 
 def get_location():
     """
@@ -56,7 +59,15 @@ def get_location():
     except Exception as e:
         st.warning(f"Could not get precise location: {e}")
     
-    # Fallback to IP-based location
+    # Fallback to IP-based location, looked up once per session instead of on every rerun
+    if st.session_state.get('ip_location') is None:
+        st.session_state['ip_location'] = get_ip_location()
+    return st.session_state['ip_location']
+
+def get_ip_location():
+    """
+    IP-based location via ipinfo.io, then geocoder, then a default.
+    """
     try:
         # Try using ipinfo.io for more accurate IP-based location
         response = requests.get('https://ipinfo.io/json')
@@ -76,20 +87,14 @@ def get_location():
     # If all methods fail, return a default location
     return 28.6139, 77.2090  # Default to New Delhi coordinates
 
-def process_image(image):
-    class_name = []
-    with open(r'utils/obj.names', 'r') as f:
-        class_name = [cname.strip() for cname in f.readlines()]
-    
-    net = cv.dnn.readNet(r'utils/yolov4_tiny.weights', r'utils/yolov4_tiny.cfg')
-    model = cv.dnn_DetectionModel(net)
-    model.setInputParams(size=(640, 480), scale=1/255, swapRB=True)
+def process_image(image, roi):
+    model = load_model()
     
     height, width, _ = image.shape
     image_area = height * width
     total_pothole_area = 0
     
-    classes, scores, boxes = model.detect(image, 0.5, 0.4)
+    classes, scores, boxes = roi.detect(model, image, 0.5, 0.4)
     
     # Get current location
     lat, lon = get_location()
@@ -115,14 +120,8 @@ def process_image(image):
     pothole_data = pd.DataFrame(pothole_list, columns=["Latitude", "Longitude", "Pothole Area (pixels)", "Severity", "Timestamp"])
     return image, pothole_data
 
-def process_video(video_path):
-    class_name = []
-    with open(r'utils/obj.names', 'r') as f:
-        class_name = [cname.strip() for cname in f.readlines()]
-    
-    net = cv.dnn.readNet(r'utils/yolov4_tiny.weights', r'utils/yolov4_tiny.cfg')
-    model = cv.dnn_DetectionModel(net)
-    model.setInputParams(size=(640, 480), scale=1/255, swapRB=True)
+def process_video(video_path, roi):
+    model = load_model()
     
     cap = cv.VideoCapture(video_path)
     ret, frame = cap.read()
@@ -137,6 +136,7 @@ def process_video(video_path):
     # Get current location
     lat, lon = get_location()
     pothole_list = []
+    confirmer = TemporalConfirmer(m=CONFIRM_M, n=CONFIRM_N, min_confidence=MIN_CONFIDENCE)
     
     # Get current timestamp
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -146,7 +146,7 @@ def process_video(video_path):
         if not ret:
             break
         
-        classes, scores, boxes = model.detect(frame, 0.5, 0.4)
+        classes, scores, boxes = roi.detect(model, frame, 0.5, 0.4)
         for (classid, score, box) in zip(classes, scores, boxes):
             label = "pothole"
             x, y, w, h = box
@@ -156,11 +156,13 @@ def process_video(video_path):
             
             cv.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
             cv.putText(frame, f"{label} ({severity})", (x, y - 10), cv.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
-            
-            # Add pothole to list - only add unique potholes (simple approach: check if box coordinates are different)
-            # This is a simple approach to avoid duplicates from the same video frame
-            if not any(abs(x-prev_x) < 10 and abs(y-prev_y) < 10 for prev_x, prev_y, _, _ in [box_data[2:6] for box_data in pothole_list]):
-                pothole_list.append([lat, lon, pothole_area, severity, timestamp])
+        
+        # Only potholes seen across several frames are recorded, once per pothole
+        for track in confirmer.update(scores, boxes):
+            _, _, w, h = track.best_box
+            pothole_area = w * h
+            severity = "High" if (pothole_area / (width * height)) > 0.02 else "Medium" if (pothole_area / (width * height)) > 0.007 else "Low"
+            pothole_list.append([lat, lon, pothole_area, severity, timestamp])
         
         result.write(frame)
     
@@ -174,14 +176,8 @@ def process_video(video_path):
         return pothole_data
     return None
 
-def process_camera():
-    class_name = []
-    with open(r'utils/obj.names', 'r') as f:
-        class_name = [cname.strip() for cname in f.readlines()]
-    
-    net = cv.dnn.readNet(r'utils/yolov4_tiny.weights', r'utils/yolov4_tiny.cfg')
-    model = cv.dnn_DetectionModel(net)
-    model.setInputParams(size=(640, 480), scale=1/255, swapRB=True)
+def process_camera(roi):
+    model = load_model()
     
     cap = cv.VideoCapture(0)
     if not cap.isOpened():
@@ -194,6 +190,7 @@ def process_camera():
     # Get current location
     lat, lon = get_location()
     pothole_list = []
+    confirmer = TemporalConfirmer(m=CONFIRM_M, n=CONFIRM_N, min_confidence=MIN_CONFIDENCE)
     
     # Get current timestamp
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -205,7 +202,7 @@ def process_camera():
         if not ret:
             break
         
-        classes, scores, boxes = model.detect(frame, 0.5, 0.4)
+        classes, scores, boxes = roi.detect(model, frame, 0.5, 0.4)
         for (classid, score, box) in zip(classes, scores, boxes):
             label = "pothole"
             x, y, w, h = box
@@ -215,10 +212,13 @@ def process_camera():
             
             cv.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
             cv.putText(frame, f"{label} ({severity})", (x, y - 10), cv.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
-            
-            # Add pothole to list - only add unique potholes (simple approach: check if box coordinates are different)
-            if not any(abs(x-prev_x) < 10 and abs(y-prev_y) < 10 for prev_x, prev_y, _, _ in [box_data[2:6] for box_data in pothole_list]):
-                pothole_list.append([lat, lon, pothole_area, severity, timestamp])
+        
+        # Only potholes seen across several frames are recorded, once per pothole
+        for track in confirmer.update(scores, boxes):
+            _, _, w, h = track.best_box
+            pothole_area = w * h
+            severity = "High" if (pothole_area / (width * height)) > 0.02 else "Medium" if (pothole_area / (width * height)) > 0.007 else "Low"
+            pothole_list.append([lat, lon, pothole_area, severity, timestamp])
         
         stframe.image(frame, channels="BGR")
         
@@ -251,6 +251,11 @@ def main():
     #st.sidebar.page_link("pages/realtime2.py", label="Go to Report a POTHOLE")
     st.sidebar.page_link("pages/map.py", label="Go to Report a POTHOLE")
     #st.sidebar.page_link("pages/visualize_potholes.py", label="Go to Map")
+    
+    # Camera profile decides which part of the frame is sent to the model
+    profiles = list_profiles() or ["default"]
+    camera_profile = st.sidebar.selectbox("Camera ROI Profile", profiles)
+    roi = load_roi(camera_profile)
     option = st.radio("Select Input Type", ("Image", "Video", "Real-time Camera"))
     
     if option == "Image":
@@ -258,7 +263,7 @@ def main():
         if uploaded_image is not None:
             image = np.asarray(bytearray(uploaded_image.read()), dtype=np.uint8)
             image = cv.imdecode(image, cv.IMREAD_COLOR)
-            processed_image, pothole_data = process_image(image)
+            processed_image, pothole_data = process_image(image, roi)
             # AREA CALCULATION
             st.table(pothole_data)
             height, width, _ = image.shape
@@ -307,7 +312,7 @@ def main():
                 f.write(uploaded_file.read())
             
             if st.button("Run Detection", key="run_detection_video"):
-                pothole_data = process_video(temp_video_path)
+                pothole_data = process_video(temp_video_path, roi)
                 
                 # Save CSV - MODIFIED TO APPEND DATA FROM VIDEO
                 if pothole_data is not None and not pothole_data.empty:
@@ -337,7 +342,7 @@ def main():
     
     elif option == "Real-time Camera":
         if st.button("Start Detection", key="start_detection_camera"):
-            pothole_data = process_camera()
+            pothole_data = process_camera(roi)
             
             # Save CSV - MODIFIED TO APPEND DATA FROM CAMERA
             if pothole_data is not None and not pothole_data.empty:
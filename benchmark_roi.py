@@ -0,0 +1,53 @@
+import argparse
+import time
+
+import cv2 as cv
+
+from detector import load_model
+from roi import RoadROI, load_roi
+
+def run_clip(model, clip_path, roi, max_frames):
+    # Returns (mean latency in ms, total detections, frames processed)
+    cap = cv.VideoCapture(clip_path)
+    latencies = []
+    detections = 0
+    while len(latencies) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        start = time.perf_counter()
+        classes, scores, boxes = roi.detect(model, frame, 0.5, 0.4)
+        latencies.append((time.perf_counter() - start) * 1000)
+        detections += len(boxes)
+    cap.release()
+    if not latencies:
+        return 0.0, 0, 0
+    return sum(latencies) / len(latencies), detections, len(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full-frame and ROI-cropped pothole detection.")
+    parser.add_argument("clips", nargs="+", help="Sample video clips")
+    parser.add_argument("--profile", default="dashcam_front", help="Camera profile from utils/roi.json")
+    parser.add_argument("--max-frames", type=int, default=300)
+    args = parser.parse_args()
+
+    model = load_model()
+    full_frame = RoadROI()
+    roi = load_roi(args.profile)
+
+    print(f"{'clip':<30} {'frames':>6} {'full ms':>8} {'roi ms':>8} {'speedup':>8} {'full det':>8} {'roi det':>8}")
+    for clip in args.clips:
+        # Warm up each input size right before its run so neither pays for the
+        # network reshape when the input size changes
+        run_clip(model, clip, full_frame, 5)
+        full_ms, full_det, frames = run_clip(model, clip, full_frame, args.max_frames)
+        run_clip(model, clip, roi, 5)
+        roi_ms, roi_det, _ = run_clip(model, clip, roi, args.max_frames)
+        if frames == 0:
+            print(f"{clip:<30} could not read any frames")
+            continue
+        speedup = full_ms / roi_ms if roi_ms else 0.0
+        print(f"{clip:<30} {frames:>6} {full_ms:>8.1f} {roi_ms:>8.1f} {speedup:>7.2f}x {full_det:>8} {roi_det:>8}")
+
+if __name__ == "__main__":
+    main()
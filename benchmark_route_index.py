@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import route_index
+
+def write_grid_roads(path, roads, vertices):
+    # `roads` east-west and `roads` north-south roads over a 10 x 10 degree box
+    lats = np.linspace(20, 30, roads)
+    lngs = np.linspace(75, 85, roads)
+    features = []
+    for lat in lats:
+        coords = [[float(lng), float(lat)] for lng in np.linspace(75, 85, vertices)]
+        features.append({"type": "Feature", "geometry": {"type": "LineString", "coordinates": coords}})
+    for lng in lngs:
+        coords = [[float(lng), float(lat)] for lat in np.linspace(20, 30, vertices)]
+        features.append({"type": "Feature", "geometry": {"type": "LineString", "coordinates": coords}})
+    with open(path, 'w') as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+    return lats
+
+def synthetic_potholes(rng, road_lats, count):
+    # Potholes scattered a few meters off random east-west roads
+    road = rng.integers(0, len(road_lats), count)
+    return pd.DataFrame({
+        "Latitude": road_lats[road] + rng.normal(0, 5 / route_index.METERS_PER_DEG_LAT, count),
+        "Longitude": rng.uniform(75, 85, count),
+        "Severity": "High",
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description="Time route corridor queries on a synthetic road grid.")
+    parser.add_argument("--roads", type=int, default=300, help="Roads per direction")
+    parser.add_argument("--vertices", type=int, default=200, help="Vertices per road")
+    parser.add_argument("--potholes", type=int, default=200000)
+    parser.add_argument("--appended", type=int, default=50, help="Rows appended between map reruns")
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        roads_path = os.path.join(tmp, "roads.geojson")
+        potholes_path = os.path.join(tmp, "pothole_data.csv")
+        road_lats = write_grid_roads(roads_path, args.roads, args.vertices)
+        potholes = synthetic_potholes(rng, road_lats, args.potholes)
+        potholes.to_csv(potholes_path, index=False)
+
+        start = time.perf_counter()
+        index = route_index.get_index(roads_path, potholes_path)
+        build_s = time.perf_counter() - start
+        print(f"segments {len(index.segments)}, potholes {len(index.potholes)}")
+        print(f"  build index        {build_s:>8.2f} s")
+
+        # An ingest flush appends a few rows; the next map rerun snaps only those
+        appended = synthetic_potholes(rng, road_lats, args.appended)
+        appended.to_csv(potholes_path, mode='a', header=False, index=False)
+        start = time.perf_counter()
+        index = route_index.get_index(roads_path, potholes_path)
+        append_ms = (time.perf_counter() - start) * 1000
+        print(f"  refresh +{args.appended:<5} rows  {append_ms:>8.1f} ms ({len(index.potholes)} potholes)")
+
+        latencies = []
+        found = 0
+        for _ in range(args.queries):
+            lat = float(rng.choice(road_lats))
+            lng = float(rng.uniform(75, 84))
+            route = [(lat, lng), (lat, lng + 1.0), (lat + 0.05, lng + 1.0)]
+            start = time.perf_counter()
+            found += len(index.potholes_along_route(route, corridor_m=20))
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        print(f"  route query median {latencies[len(latencies) // 2]:>8.1f} ms")
+        print(f"  route query p95    {latencies[int(len(latencies) * 0.95)]:>8.1f} ms")
+        print(f"  mean potholes per route {found / args.queries:.1f}")
+
+if __name__ == "__main__":
+    main()
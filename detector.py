@@ -0,0 +1,42 @@
+import threading
+
+import cv2 as cv
+import streamlit as st
+
+CONFIG_FILE = r'utils/yolov4_tiny.cfg'
+WEIGHTS_FILE = r'utils/yolov4_tiny.weights'
+INPUT_SIZE = (640, 480)
+
+
+class Detector:
+    """
+    YOLOv4 Tiny detection model shared by every Streamlit session.
+
+    The input size is passed per call, and setting it and running the
+    network happen under one lock: setInputParams changes shared state and
+    Net.forward is not safe to call from several threads at once.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.lock = threading.Lock()
+
+    def detect(self, frame, conf_threshold, nms_threshold, size=INPUT_SIZE):
+        with self.lock:
+            self.model.setInputParams(size=size, scale=1/255, swapRB=True)
+            return self.model.detect(frame, conf_threshold, nms_threshold)
+
+
+@st.cache_resource
+def load_model(use_cuda=False):
+    """
+    Parse the darknet cfg and weights once per process.
+    Streamlit reruns, page switches and sessions reuse the same detector.
+    Nothing is serialized across restarts: the parse is a small part of a cold
+    start next to imports and the first inference (see startup_report.py).
+    """
+    net = cv.dnn.readNet(WEIGHTS_FILE, CONFIG_FILE)
+    if use_cuda:
+        net.setPreferableBackend(cv.dnn.DNN_BACKEND_CUDA)
+        net.setPreferableTarget(cv.dnn.DNN_TARGET_CUDA_FP16)
+    return Detector(cv.dnn_DetectionModel(net))
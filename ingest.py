@@ -0,0 +1,265 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+QUEUE_DB_FILE = "pothole_queue.db"
+SYNC_URL_ENV = "HIGHWAYSENSE_SYNC_URL"
+COLUMNS = ["Latitude", "Longitude", "Severity", "Timestamp"]
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentSinkError(Exception):
+    """
+    The sink rejected a batch for good (e.g. HTTP 400/422); retrying cannot help.
+    """
+
+
+class RetryLaterError(Exception):
+    """
+    The sink asked to be retried later (HTTP 408/429), optionally after
+    retry_after seconds.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CsvSink:
+    """
+    Appends batches of pothole records to the local pothole store.
+    """
+
+    def __init__(self, path="pothole_data.csv"):
+        self.path = path
+
+    def write(self, records):
+        import pandas as pd
+
+        pothole_data = pd.DataFrame(records, columns=COLUMNS)
+        if not os.path.exists(self.path):
+            pothole_data.to_csv(self.path, index=False)
+        else:
+            pothole_data.to_csv(self.path, mode='a', header=False, index=False)
+
+
+class HttpSink:
+    """
+    Posts batches of pothole records as JSON to a sync endpoint
+    (see sync_server.py for a local stand-in).
+    """
+
+    def __init__(self, url, timeout=5):
+        # A bad URL would fail every batch, so refuse it up front
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            raise ValueError(f"{SYNC_URL_ENV} must be an http(s) URL, got {url!r}")
+        self.url = url
+        self.timeout = timeout
+
+    def write(self, records):
+        import requests
+
+        response = requests.post(self.url, json=records, timeout=self.timeout)
+        if response.status_code in (408, 429):
+            raise RetryLaterError(f"{response.status_code} {response.reason}",
+                                  parse_retry_after(response.headers.get("Retry-After")))
+        if 400 <= response.status_code < 500:
+            raise PermanentSinkError(f"{response.status_code} {response.reason}")
+        response.raise_for_status()
+
+
+def ip_location():
+    import geocoder
+
+    g = geocoder.ip('me')
+    return tuple(g.latlng) if g.latlng else None
+
+
+class IngestQueue:
+    """
+    Offline-first buffer between the capture loop and the pothole store.
+
+    put() only hands the record to an in-memory queue, so the capture loop
+    never waits on disk or network. A background asyncio worker moves records
+    into a bounded SQLite buffer, flushes them to the sink in batches and
+    deletes them only after the sink accepted them, backing off while the
+    sink is unreachable or asks to retry later. Only batches the sink rejects
+    for good (PermanentSinkError) are moved to a dead_letter table, so they
+    cannot block later records. Dropped and rejected records are logged. The
+    IP location is refreshed by the same worker and stamped on records at
+    capture time.
+    """
+
+    def __init__(self, sink, db_path=QUEUE_DB_FILE, max_pending=10000, batch_size=50,
+                 flush_interval=2.0, max_backoff=60.0, location_interval=60.0):
+        self.sink = sink
+        self.db_path = db_path
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+        self.location_interval = location_interval
+        self.location = None
+        self.dropped = 0
+        self.rejected = 0
+        self._inbox = queue.Queue(maxsize=1000)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pothole-ingest", daemon=True)
+        self._thread.start()
+
+    def put(self, severity, timestamp):
+        # Only the location known at capture time is used; a later fix would
+        # tag the pothole at wherever the vehicle happens to be by then
+        lat, lng = self.location if self.location else ("N/A", "N/A")
+        try:
+            self._inbox.put_nowait({"Latitude": lat, "Longitude": lng,
+                                    "Severity": severity, "Timestamp": timestamp})
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("Ingest queue full, dropped a pothole record (%d dropped so far)", self.dropped)
+
+    def stop(self):
+        # The worker exits after its current step; pending rows stay in SQLite
+        self._stop.set()
+
+    def _run(self):
+        asyncio.run(self._main())
+
+    async def _main(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE IF NOT EXISTS pending (id INTEGER PRIMARY KEY AUTOINCREMENT, record TEXT NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS dead_letter (id INTEGER PRIMARY KEY, record TEXT NOT NULL, error TEXT)")
+        conn.commit()
+        try:
+            await asyncio.gather(self._locate_loop(), self._flush_loop(conn))
+        finally:
+            conn.close()
+
+    async def _locate_loop(self):
+        while not self._stop.is_set():
+            try:
+                location = await asyncio.to_thread(ip_location)
+                if location:
+                    self.location = location
+            except Exception:
+                pass
+            await self._sleep(self.location_interval)
+
+    async def _sleep(self, delay):
+        remaining = delay
+        while remaining > 0 and not self._stop.is_set():
+            step = min(1.0, remaining)
+            await asyncio.sleep(step)
+            remaining -= step
+
+    def _spool(self, conn):
+        # Move everything waiting in memory into the persistent buffer
+        rows = []
+        while True:
+            try:
+                rows.append((json.dumps(self._inbox.get_nowait()),))
+            except queue.Empty:
+                break
+        if not rows:
+            return
+        conn.executemany("INSERT INTO pending (record) VALUES (?)", rows)
+        # Keep the buffer bounded, dropping the oldest records first
+        overflow = conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0] - self.max_pending
+        if overflow > 0:
+            conn.execute("DELETE FROM pending WHERE id IN (SELECT id FROM pending ORDER BY id LIMIT ?)", (overflow,))
+            self.dropped += overflow
+            logger.warning("Ingest buffer over %d records, dropped the %d oldest (%d dropped so far)",
+                           self.max_pending, overflow, self.dropped)
+        conn.commit()
+
+    async def _wait(self, conn, delay):
+        # Sleep between flushes while still spooling, so the in-memory queue
+        # does not fill up during a long backoff
+        remaining = delay
+        while remaining > 0 and not self._stop.is_set():
+            step = min(1.0, remaining)
+            await asyncio.sleep(step)
+            self._spool(conn)
+            remaining -= step
+
+    async def _flush_loop(self, conn):
+        delay = self.flush_interval
+        while not self._stop.is_set():
+            self._spool(conn)
+            rows = conn.execute("SELECT id, record FROM pending ORDER BY id LIMIT ?", (self.batch_size,)).fetchall()
+            if not rows:
+                delay = self.flush_interval
+                await self._wait(conn, delay)
+                continue
+
+            records = [json.loads(record) for _, record in rows]
+            try:
+                await asyncio.to_thread(self.sink.write, records)
+            except PermanentSinkError as e:
+                # Retrying a rejected batch would block every later record
+                conn.executemany("INSERT INTO dead_letter (id, record, error) VALUES (?, ?, ?)",
+                                 [(row_id, record, str(e)) for row_id, record in rows])
+                self.rejected += len(rows)
+                logger.error("Sink rejected %d pothole records (%s); moved to dead_letter in %s (%d rejected so far)",
+                             len(rows), e, self.db_path, self.rejected)
+            except RetryLaterError as e:
+                # 408/429: wait as long as the server asked, else back off as usual
+                delay = min(delay * 2, self.max_backoff)
+                await self._wait(conn, e.retry_after if e.retry_after is not None else delay)
+                continue
+            except Exception as e:
+                # Connection errors, 5xx and anything unexpected: keep the batch and retry
+                delay = min(delay * 2, self.max_backoff)
+                logger.warning("Pothole sync failed (%s), retrying in %.0f s", e, delay)
+                await self._wait(conn, delay)
+                continue
+
+            conn.executemany("DELETE FROM pending WHERE id = ?", [(row_id,) for row_id, _ in rows])
+            conn.commit()
+            delay = self.flush_interval
+            if len(rows) < self.batch_size:
+                await self._wait(conn, delay)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """
+    Process-wide ingestion queue, shared across Streamlit reruns and sessions.
+    Flushes to HIGHWAYSENSE_SYNC_URL when set, otherwise to pothole_data.csv.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            url = os.environ.get(SYNC_URL_ENV)
+            sink = HttpSink(url) if url else CsvSink()
+            _queue = IngestQueue(sink)
+        return _queue
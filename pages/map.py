@@ -2,6 +2,10 @@ import streamlit as st
 import pandas as pd
 import pydeck as pdk
 import geocoder
+import os
+
+# Road network for route queries; route_index (shapely) is only imported when it exists
+ROADS_FILE = r'utils/roads.geojson'
 
 # Load the CSV file
 def load_data():
@@ -9,13 +13,26 @@ def load_data():
     df = pd.read_csv(file_path)
     return df
 
-# Get current location
+# Get current location, cached so reruns of the page skip the network lookup
+@st.cache_data(ttl=300)
 def get_current_location():
     g = geocoder.ip("me")
     if g.latlng:
         return pd.DataFrame([{"Latitude": g.latlng[0], "Longitude": g.latlng[1], "type": "current_location"}])
     return None
 
+# Parse "lat, lng" lines into a route
+def parse_route(text):
+    route = []
+    for line in text.splitlines():
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) == 2:
+            try:
+                route.append((float(parts[0]), float(parts[1])))
+            except ValueError:
+                continue
+    return route
+
 # Streamlit app
 def main():
     st.title("Pothole Locations Map")
@@ -41,6 +58,34 @@ def main():
         st.write("Your Current Location:", location_df)
         df = pd.concat([df, location_df], ignore_index=True)
     
+    # Potholes along a route, only when a road network file is available
+    layers = []
+    if os.path.exists(ROADS_FILE):
+        from route_index import get_index
+        st.write("Potholes Along a Route")
+        route_text = st.text_area("Route points (one 'latitude, longitude' per line)")
+        corridor = st.number_input("Corridor width (m)", min_value=1.0, value=20.0)
+        route = parse_route(route_text)
+        if len(route) >= 2:
+            route_potholes = get_index(roads_path=ROADS_FILE).potholes_along_route(route, corridor)
+            st.write(f"{len(route_potholes)} potholes within {corridor:.0f} m of the route")
+            st.write(route_potholes)
+            layers.append(pdk.Layer(
+                "PathLayer",
+                pd.DataFrame({"path": [[[lng, lat] for lat, lng in route]]}),
+                get_path="path",
+                get_color=[0, 0, 255, 200],
+                width_min_pixels=3,
+            ))
+            layers.append(pdk.Layer(
+                "ScatterplotLayer",
+                route_potholes,
+                get_position=["Longitude", "Latitude"],
+                get_color=[255, 200, 0, 230],
+                get_radius=150,
+                pickable=True,
+            ))
+    
     # Define color based on type
     df["color"] = df["type"].map({"pothole": [255, 0, 0, 200], "current_location": [0, 255, 0, 200]})
     st.write(df)
@@ -68,7 +113,7 @@ def main():
     )
     
     deck = pdk.Deck(
-        layers=[layer],
+        layers=[layer] + layers,
         initial_view_state=view_state,
         map_style=map_styles[map_type],
         tooltip={"text": "Latitude: {Latitude}\nLongitude: {Longitude}"}
@@ -1,11 +1,10 @@
 import cv2 as cv
-import numpy as np
-import os
 import streamlit as st
-import pandas as pd
-import geocoder
 from datetime import datetime
-from PIL import Image
+from detector import load_model
+from ingest import get_queue
+from roi import load_roi
+from temporal import CONFIRM_M, CONFIRM_N, MIN_CONFIDENCE, TemporalConfirmer
 
 st.title("Real-Time Pothole Detection App")
 
@@ -19,71 +18,72 @@ if stop_button:
     capture = False
 
 try:
-    class_name = []
-    with open(r'utils/obj.names', 'r') as f:
-        class_name = [cname.strip() for cname in f.readlines()]
+    model = load_model(use_cuda=True)
 
-    net = cv.dnn.readNet(r'utils/yolov4_tiny.weights', r'utils/yolov4_tiny.cfg')
-    net.setPreferableBackend(cv.dnn.DNN_BACKEND_CUDA)
-    net.setPreferableTarget(cv.dnn.DNN_TARGET_CUDA_FP16)
-    model = cv.dnn_DetectionModel(net)
-    model.setInputParams(size=(640, 480), scale=1/255, swapRB=True)
+    camera_id = 0
+    roi = load_roi(camera_id)  # Road region for this camera, see utils/roi.json
 
-    cap = cv.VideoCapture(0)  # Open the default camera
+    cap = cv.VideoCapture(camera_id)  # Open the default camera
     if not cap.isOpened():
         st.error("Could not open camera")
         st.stop()
 
     Conf_threshold = 0.5
     NMS_threshold = 0.4
-    pothole_data_file = "pothole_data.csv"
+    # Confirmed potholes are buffered locally and written by a background worker
+    ingest_queue = get_queue()
+
+    # A pothole is written once, after it was seen in CONFIRM_M of the last
+    # CONFIRM_N frames with an average confidence of at least MIN_CONFIDENCE
+    confirmer = TemporalConfirmer(m=CONFIRM_M, n=CONFIRM_N, min_confidence=MIN_CONFIDENCE)
+
+    severity_threshold_low = 0.007  # Adjust as needed
+    severity_threshold_medium = 0.020  # Adjust as needed
+
+    def get_severity(box, area):
+        recarea = box[2] * box[3]
+        if (recarea / area) <= severity_threshold_low:
+            return "Low"
+        elif (recarea / area) <= severity_threshold_medium:
+            return "Medium"
+        return "High"
 
     stframe = st.image([])
+    sync_status = st.empty()
+    lost = (0, 0)
 
     while capture:
         ret, frame = cap.read()
         if not ret:
             break
 
-        classes, scores, boxes = model.detect(frame, Conf_threshold, NMS_threshold)
+        classes, scores, boxes = roi.detect(model, frame, Conf_threshold, NMS_threshold)
+        area = frame.shape[0] * frame.shape[1]
+        confirmed = confirmer.update(scores, boxes)
+
         for (classid, score, box) in zip(classes, scores, boxes):
             label = "pothole"
             x, y, w, h = box
-            recarea = w * h
-            area = frame.shape[0] * frame.shape[1]
-
-            severity = ""
-            severity_threshold_low = 0.007  # Adjust as needed
-            severity_threshold_medium = 0.020  # Adjust as needed
-
-            if len(scores) != 0 and scores[0] >= 0.7:
-                if (recarea / area) <= severity_threshold_low:
-                    severity = "Low"
-                elif (recarea / area) <= severity_threshold_medium:
-                    severity = "Medium"
-                else:
-                    severity = "High"
-
-                if severity:
-                    cv.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                    cv.putText(frame, f"{label} ({severity} Severity)",
-                               (x, y - 10), cv.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
-                    
-                    # Get timestamp
-                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    
-                    # Get latitude and longitude
-                    g = geocoder.ip('me')
-                    lat, lng = g.latlng if g.latlng else ("N/A", "N/A")
-                    
-                    # Append data to CSV file
-                    pothole_data = pd.DataFrame([[lat, lng, severity, timestamp]],
-                                                columns=["Latitude", "Longitude", "Severity", "Timestamp"])
-                    if not os.path.exists(pothole_data_file):
-                        pothole_data.to_csv(pothole_data_file, index=False)
-                    else:
-                        pothole_data.to_csv(pothole_data_file, mode='a', header=False, index=False)
-        
+            severity = get_severity(box, area)
+            # Unconfirmed boxes are still drawn, just in a different colour
+            color = (0, 255, 0) if confirmer.is_confirmed(box) else (0, 255, 255)
+            cv.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+            cv.putText(frame, f"{label} ({severity} Severity)",
+                       (x, y - 10), cv.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
+
+        for track in confirmed:
+            severity = get_severity(track.best_box, area)
+
+            # Get timestamp
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            ingest_queue.put(severity, timestamp)
+
+        # Surface records the queue had to drop or the sync endpoint rejected
+        if (ingest_queue.dropped, ingest_queue.rejected) != lost:
+            lost = (ingest_queue.dropped, ingest_queue.rejected)
+            sync_status.warning(f"Pothole sync: {lost[0]} records dropped, "
+                                f"{lost[1]} rejected (kept in {ingest_queue.db_path} dead_letter)")
+
         frame_rgb = cv.cvtColor(frame, cv.COLOR_BGR2RGB)
         stframe.image(frame_rgb, channels="RGB")
 
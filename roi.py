@@ -0,0 +1,119 @@
+import json
+import os
+
+import cv2 as cv
+import numpy as np
+
+ROI_CONFIG_FILE = r'utils/roi.json'
+
+
+class RoadROI:
+    """
+    Region of interest for a fixed-mount camera.
+
+    The frame is cropped to the road band (below the horizon, above the hood)
+    before the blob is built, and detections whose centre falls outside the
+    road polygon are dropped. All values in the config are fractions of the
+    frame size so one profile works for any capture resolution.
+    """
+
+    def __init__(self, horizon=0.0, hood=0.0, polygon=None):
+        self.horizon = float(horizon)
+        self.hood = float(hood)
+        self.polygon = polygon
+        # An empty crop would make model.detect fail on every frame
+        if not (0.0 <= self.horizon < 1.0 and 0.0 <= self.hood < 1.0):
+            raise ValueError("ROI horizon and hood must be fractions in [0, 1)")
+        if self.horizon + self.hood >= 1.0:
+            raise ValueError("ROI horizon and hood leave no road band to crop")
+        if polygon:
+            if len(polygon) < 3 or any(not (0.0 <= v <= 1.0) for point in polygon for v in point):
+                raise ValueError("ROI polygon needs at least 3 points with coordinates in [0, 1]")
+            xs = [x for x, _ in polygon]
+            ys = [y for _, y in polygon]
+            if max(xs) <= min(xs) or max(ys) <= self.horizon or min(ys) >= 1.0 - self.hood:
+                raise ValueError("ROI polygon does not overlap the road band")
+
+    def bounds(self, frame_shape):
+        # Pixel rectangle (x0, y0, x1, y1) that gets sent to the network
+        height, width = frame_shape[:2]
+        y0 = int(height * self.horizon)
+        y1 = int(height * (1.0 - self.hood))
+        x0, x1 = 0, width
+        if self.polygon:
+            pts = self.polygon_pixels(frame_shape)
+            x0 = max(x0, int(pts[:, 0].min()))
+            x1 = min(x1, int(pts[:, 0].max()) + 1)
+            y0 = max(y0, int(pts[:, 1].min()))
+            y1 = min(y1, int(pts[:, 1].max()) + 1)
+        # Keep at least one pixel on very small frames
+        return x0, y0, max(x1, x0 + 1), max(y1, y0 + 1)
+
+    def polygon_pixels(self, frame_shape):
+        height, width = frame_shape[:2]
+        return np.array([[x * width, y * height] for x, y in self.polygon], dtype=np.float32)
+
+    def input_size(self, frame_shape, base=(640, 480)):
+        # Shrink the network input in proportion to the crop so the blob really
+        # gets smaller; YOLO needs both sides to be a multiple of 32.
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = self.bounds(frame_shape)
+        in_w = max(32, int(round(base[0] * (x1 - x0) / width / 32)) * 32)
+        in_h = max(32, int(round(base[1] * (y1 - y0) / height / 32)) * 32)
+        return in_w, in_h
+
+    def detect(self, model, frame, conf_threshold, nms_threshold, base_size=(640, 480)):
+        """
+        Run the detector (see detector.Detector) on the road crop only and return
+        boxes in full-frame coordinates, keeping just the ones inside the road polygon.
+        """
+        x0, y0, x1, y1 = self.bounds(frame.shape)
+        classes, scores, boxes = model.detect(frame[y0:y1, x0:x1], conf_threshold, nms_threshold,
+                                              size=self.input_size(frame.shape, base_size))
+        if len(boxes) == 0:
+            return classes, scores, boxes
+
+        boxes = np.array(boxes).reshape(-1, 4)
+        boxes[:, 0] += x0
+        boxes[:, 1] += y0
+        if not self.polygon:
+            return classes, scores, boxes
+
+        pts = self.polygon_pixels(frame.shape)
+        keep = [
+            cv.pointPolygonTest(pts, (float(x + w / 2), float(y + h / 2)), False) >= 0
+            for x, y, w, h in boxes
+        ]
+        keep = np.array(keep, dtype=bool)
+        return np.array(classes).reshape(-1)[keep], np.array(scores).reshape(-1)[keep], boxes[keep]
+
+
+def list_profiles():
+    # Named profiles only; camera index aliases like "0" are not offered separately
+    if not os.path.exists(ROI_CONFIG_FILE):
+        return []
+    with open(ROI_CONFIG_FILE, 'r') as f:
+        return [name for name, profile in json.load(f).items() if isinstance(profile, dict)]
+
+
+def load_roi(camera_id="default"):
+    """
+    Load the ROI profile for a camera from utils/roi.json.
+    camera_id is a profile name or a camera index mapped to one.
+    Falls back to the "default" profile, then to the full frame.
+    """
+    if not os.path.exists(ROI_CONFIG_FILE):
+        return RoadROI()
+    with open(ROI_CONFIG_FILE, 'r') as f:
+        profiles = json.load(f)
+    profile = profiles.get(str(camera_id), profiles.get("default"))
+    # A camera index can point at a named profile, e.g. "0": "dashcam_front"
+    if isinstance(profile, str):
+        profile = profiles.get(profile)
+    if not profile:
+        return RoadROI()
+    return RoadROI(
+        horizon=profile.get("horizon", 0.0),
+        hood=profile.get("hood", 0.0),
+        polygon=profile.get("polygon"),
+    )
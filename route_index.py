@@ -0,0 +1,309 @@
+import copy
+import io
+import json
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree
+
+ROADS_FILE = r'utils/roads.geojson'
+POTHOLES_FILE = "pothole_data.csv"
+METERS_PER_DEG_LAT = 110540.0
+METERS_PER_DEG_LON = 111320.0
+
+
+def load_road_segments(path=ROADS_FILE):
+    """
+    Read LineString/MultiLineString roads from a GeoJSON file and split them
+    into straight segments, returned as an (N, 4) array of lng1, lat1, lng2, lat2.
+    """
+    with open(path, 'r') as f:
+        features = json.load(f).get("features", [])
+
+    segments = []
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "LineString":
+            lines = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiLineString":
+            lines = geometry["coordinates"]
+        else:
+            continue
+        for line in lines:
+            for (lng1, lat1, *_), (lng2, lat2, *_) in zip(line[:-1], line[1:]):
+                segments.append((lng1, lat1, lng2, lat2))
+    return np.array(segments, dtype=np.float64).reshape(-1, 4)
+
+
+def load_potholes(path=POTHOLES_FILE):
+    """
+    Load potholes from the CSV store or from a JSON list with lat/lng keys.
+    Rows without a usable location (e.g. "N/A") are dropped.
+    """
+    if path.endswith(".json"):
+        with open(path, 'r') as f:
+            df = pd.DataFrame(json.load(f)).rename(columns={"lat": "Latitude", "lng": "Longitude"})
+    else:
+        df = pd.read_csv(path)
+    return _clean_potholes(df)
+
+
+def _clean_potholes(df):
+    df["Latitude"] = pd.to_numeric(df["Latitude"], errors="coerce")
+    df["Longitude"] = pd.to_numeric(df["Longitude"], errors="coerce")
+    return df.dropna(subset=["Latitude", "Longitude"]).reset_index(drop=True)
+
+
+def _segment_boxes(segments, meters):
+    lng_min = np.minimum(segments[:, 0], segments[:, 2])
+    lng_max = np.maximum(segments[:, 0], segments[:, 2])
+    lat_min = np.minimum(segments[:, 1], segments[:, 3])
+    lat_max = np.maximum(segments[:, 1], segments[:, 3])
+    worst_lat = np.maximum(np.abs(lat_min), np.abs(lat_max))
+    d_lat = meters / METERS_PER_DEG_LAT
+    d_lng = meters / (METERS_PER_DEG_LON * np.maximum(np.cos(np.radians(worst_lat)), 0.01))
+    return shapely.box(lng_min - d_lng, lat_min - d_lat, lng_max + d_lng, lat_max + d_lat)
+
+
+def point_segment_distance(lats, lngs, segments):
+    """
+    Distance in meters from each point to the matching segment, using a local
+    equirectangular projection around the point. Also returns the position of
+    the closest point along the segment as a 0..1 fraction.
+    """
+    scale_x = METERS_PER_DEG_LON * np.cos(np.radians(lats))
+    ax = (segments[:, 0] - lngs) * scale_x
+    ay = (segments[:, 1] - lats) * METERS_PER_DEG_LAT
+    bx = (segments[:, 2] - lngs) * scale_x
+    by = (segments[:, 3] - lats) * METERS_PER_DEG_LAT
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    t = np.where(length_sq > 0, -(ax * dx + ay * dy) / np.where(length_sq > 0, length_sq, 1), 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    px, py = ax + t * dx, ay + t * dy
+    return np.hypot(px, py), t
+
+
+def segment_lengths(segments):
+    mid_lat = (segments[:, 1] + segments[:, 3]) / 2
+    dx = (segments[:, 2] - segments[:, 0]) * METERS_PER_DEG_LON * np.cos(np.radians(mid_lat))
+    dy = (segments[:, 3] - segments[:, 1]) * METERS_PER_DEG_LAT
+    return np.hypot(dx, dy)
+
+
+class RoadIndex:
+    """
+    R-tree over road segments with potholes snapped to their nearest segment.
+
+    Route queries only touch the road segments whose envelope meets the route
+    corridor and the potholes snapped to them, so the cost depends on the
+    route, not on the number of potholes in the store.
+    """
+
+    def __init__(self, segments, max_snap_m=30.0):
+        self.segments = segments
+        self.max_snap_m = max_snap_m
+        self.tree = STRtree(shapely.linestrings(segments.reshape(-1, 2, 2)))
+        self.potholes = pd.DataFrame(columns=["Latitude", "Longitude"])
+        self.pothole_segment = np.empty(0, dtype=np.int64)
+        self.segment_potholes = {}
+
+    def _nearest_segments(self, lats, lngs):
+        # Index of the nearest segment within max_snap_m for each point, or -1
+        snapped = np.full(len(lats), -1, dtype=np.int64)
+        if not len(lats) or not len(self.segments):
+            return snapped
+        d_lat = self.max_snap_m / METERS_PER_DEG_LAT
+        d_lng = self.max_snap_m / (METERS_PER_DEG_LON * np.maximum(np.cos(np.radians(lats)), 0.01))
+        boxes = shapely.box(lngs - d_lng, lats - d_lat, lngs + d_lng, lats + d_lat)
+        point_idx, seg_idx = self.tree.query(boxes)
+        if not len(point_idx):
+            return snapped
+        dist, _ = point_segment_distance(lats[point_idx], lngs[point_idx], self.segments[seg_idx])
+        within = dist <= self.max_snap_m
+        point_idx, seg_idx, dist = point_idx[within], seg_idx[within], dist[within]
+        # Nearest segment per pothole: sort by distance and keep the first hit
+        order = np.lexsort((dist, point_idx))
+        point_idx, seg_idx = point_idx[order], seg_idx[order]
+        first = np.ones(len(point_idx), dtype=bool)
+        first[1:] = point_idx[1:] != point_idx[:-1]
+        snapped[point_idx[first]] = seg_idx[first]
+        return snapped
+
+    def snap(self, potholes):
+        """
+        Replace the snapped potholes. Each one is attached to the nearest road
+        segment within max_snap_m; potholes farther than that from every road
+        are left unsnapped.
+        """
+        self.potholes = pd.DataFrame(columns=["Latitude", "Longitude"])
+        self.pothole_segment = np.empty(0, dtype=np.int64)
+        self.segment_potholes = {}
+        return self.add_potholes(potholes)
+
+    def add_potholes(self, potholes):
+        """
+        Snap more potholes without touching the ones already indexed.
+        """
+        potholes = potholes.reset_index(drop=True)
+        snapped = self._nearest_segments(potholes["Latitude"].to_numpy(dtype=np.float64),
+                                         potholes["Longitude"].to_numpy(dtype=np.float64))
+        start = len(self.potholes)
+        # Rows go in before the segment lists that point at them, so a
+        # concurrent query never sees an index past the end of the frame
+        self.potholes = pd.concat([self.potholes, potholes], ignore_index=True) if start else potholes
+        self.pothole_segment = np.concatenate([self.pothole_segment, snapped])
+        for offset, segment in enumerate(snapped):
+            if segment >= 0:
+                self.segment_potholes.setdefault(int(segment), []).append(start + offset)
+        return self
+
+    def potholes_along_route(self, route, corridor_m=20.0):
+        """
+        Potholes within corridor_m meters of a route given as [(lat, lng), ...].
+        The result is ordered by distance along the route, which is the order a
+        driver reaches them in.
+        """
+        columns = list(self.potholes.columns) + ["Distance From Route (m)", "Distance Along Route (m)"]
+        route = np.asarray(route, dtype=np.float64).reshape(-1, 2)
+        if len(route) < 2 or not self.segment_potholes:
+            return pd.DataFrame(columns=columns)
+
+        # Route segments in the same lng1, lat1, lng2, lat2 layout as the roads
+        route_segments = np.column_stack([route[:-1, 1], route[:-1, 0], route[1:, 1], route[1:, 0]])
+        route_start = np.concatenate([[0.0], np.cumsum(segment_lengths(route_segments))[:-1]])
+
+        # A pothole is at most max_snap_m from its road, so widen the envelope by both
+        route_idx, road_idx = self.tree.query(_segment_boxes(route_segments, corridor_m + self.max_snap_m))
+        pair_route, pair_pothole = [], []
+        for r, s in zip(route_idx, road_idx):
+            for pothole in self.segment_potholes.get(int(s), ()):
+                pair_route.append(r)
+                pair_pothole.append(pothole)
+        if not pair_route:
+            return pd.DataFrame(columns=columns)
+
+        pair_route = np.array(pair_route)
+        pair_pothole = np.array(pair_pothole)
+        lats = self.potholes["Latitude"].to_numpy(dtype=np.float64)[pair_pothole]
+        lngs = self.potholes["Longitude"].to_numpy(dtype=np.float64)[pair_pothole]
+        segments = route_segments[pair_route]
+        dist, t = point_segment_distance(lats, lngs, segments)
+        along = route_start[pair_route] + t * segment_lengths(segments)
+
+        within = dist <= corridor_m
+        pair_pothole, dist, along = pair_pothole[within], dist[within], along[within]
+        # Closest route segment per pothole
+        order = np.lexsort((dist, pair_pothole))
+        pair_pothole, dist, along = pair_pothole[order], dist[order], along[order]
+        first = np.ones(len(pair_pothole), dtype=bool)
+        first[1:] = pair_pothole[1:] != pair_pothole[:-1]
+
+        result = self.potholes.iloc[pair_pothole[first]].copy()
+        result["Distance From Route (m)"] = dist[first].round(1)
+        result["Distance Along Route (m)"] = along[first].round(1)
+        return result.sort_values("Distance Along Route (m)")
+
+
+@lru_cache(maxsize=4)
+def _road_index(path, mtime, max_snap_m):
+    return RoadIndex(load_road_segments(path), max_snap_m)
+
+
+def _parse_csv(data):
+    if not data.strip():
+        return pd.DataFrame(columns=["Latitude", "Longitude"])
+    return _clean_potholes(pd.read_csv(io.BytesIO(data)))
+
+
+class PotholeFeed:
+    """
+    Keeps a RoadIndex in step with the pothole store.
+
+    The CSV store is append-only in practice (the ingest worker adds a few rows
+    at a time), so a refresh parses and snaps only the complete lines written
+    since the last one. The bytes just before the previous end are compared to
+    detect a rewritten or truncated file, which, like a change to the roads
+    file, triggers a full rebuild. JSON sources are rebuilt when their mtime changes.
+    """
+
+    TAIL_BYTES = 64
+
+    def __init__(self, roads_path, potholes_path, max_snap_m):
+        self.roads_path = roads_path
+        self.potholes_path = potholes_path
+        self.max_snap_m = max_snap_m
+        self.index = None
+        self.roads_mtime = None
+        self.potholes_mtime = None
+        self.header = b""
+        self.offset = 0
+        self.tail = b""
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        with self.lock:
+            roads_mtime = os.path.getmtime(self.roads_path)
+            if self.index is None or roads_mtime != self.roads_mtime or not self._read_appended():
+                self._rebuild(roads_mtime)
+            return self.index
+
+    def _rebuild(self, roads_mtime):
+        # The R-tree is shared between rebuilds; only the snapping is redone
+        index = copy.copy(_road_index(self.roads_path, roads_mtime, self.max_snap_m))
+        if self.potholes_path.endswith(".json"):
+            self.potholes_mtime = os.path.getmtime(self.potholes_path)
+            index.snap(load_potholes(self.potholes_path))
+        else:
+            with open(self.potholes_path, 'rb') as f:
+                data = f.read()
+            data = data[:data.rfind(b"\n") + 1]
+            self.header = data[:data.find(b"\n") + 1]
+            self.offset = len(data)
+            self.tail = data[-self.TAIL_BYTES:]
+            index.snap(_parse_csv(data))
+        self.index = index
+        self.roads_mtime = roads_mtime
+
+    def _read_appended(self):
+        # True when the index is current after taking in only the appended rows
+        if self.potholes_path.endswith(".json"):
+            return os.path.getmtime(self.potholes_path) == self.potholes_mtime
+        with open(self.potholes_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < self.offset:
+                return False
+            f.seek(self.offset - len(self.tail))
+            if f.read(len(self.tail)) != self.tail:
+                return False
+            chunk = f.read()
+        # Leave a partially written last line for the next refresh
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return True
+        if not self.header:
+            return False
+        self.index.add_potholes(_parse_csv(self.header + chunk[:end]))
+        self.tail = (self.tail + chunk[:end])[-self.TAIL_BYTES:]
+        self.offset += end
+        return True
+
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def get_index(roads_path=ROADS_FILE, potholes_path=POTHOLES_FILE, max_snap_m=30.0):
+    """
+    Road index with the current potholes snapped to it. The index stays in
+    memory; new rows appended to the pothole store are snapped incrementally.
+    """
+    key = (roads_path, potholes_path, max_snap_m)
+    with _feeds_lock:
+        feed = _feeds.get(key)
+        if feed is None:
+            feed = _feeds[key] = PotholeFeed(roads_path, potholes_path, max_snap_m)
+    return feed.refresh()
@@ -0,0 +1,86 @@
+import ast
+import os
+import subprocess
+import sys
+import time
+
+# Entry points whose cold start we care about, relative to the repository root
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PAGES = ["app_updated.py", "pages/map.py", "realtime.py"]
+
+def page_imports(path):
+    # Top-level imports of a page, in the order it runs them
+    with open(os.path.join(ROOT, path), 'r') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+def time_page_imports(modules):
+    """
+    Import a page's modules in one fresh interpreter with -X importtime.
+    Returns (module, cumulative ms) for the modules the page names directly;
+    shared dependencies are charged once, to whichever module loaded them first.
+    """
+    code = "\n".join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    costs = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented; only the page's own imports sit at the left
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+        costs[name.strip()] = int(cumulative) / 1000
+    return [(module, costs.get(module, 0.0)) for module in modules]
+
+def time_model_load():
+    import numpy as np
+    import detector
+
+    start = time.perf_counter()
+    model = detector.load_model()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    model.detect(np.zeros((480, 640, 3), dtype=np.uint8), 0.5, 0.4)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    detector.load_model()
+    cached_ms = (time.perf_counter() - start) * 1000
+    return load_ms, first_ms, cached_ms
+
+def main():
+    for page in PAGES:
+        print(f"Imports for {page} (one interpreter)")
+        try:
+            costs = time_page_imports(page_imports(page))
+        except RuntimeError as e:
+            print(f"  Could not import: {e}")
+            continue
+        for module, ms in costs:
+            print(f"  {module:<24} {ms:>8.1f} ms")
+        print(f"  {'total':<24} {sum(ms for _, ms in costs):>8.1f} ms")
+
+    print("Model load")
+    try:
+        load_ms, first_ms, cached_ms = time_model_load()
+    except Exception as e:
+        print(f"  Could not load model: {e}")
+        return
+    print(f"  parse darknet     {load_ms:>8.1f} ms")
+    print(f"  first inference   {first_ms:>8.1f} ms")
+    print(f"  cached reload     {cached_ms:>8.1f} ms")
+
+if __name__ == "__main__":
+    main()
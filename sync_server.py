@@ -0,0 +1,56 @@
+import argparse
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ingest import CsvSink
+
+# Local stand-in for the pothole sync endpoint. Run it and start the realtime
+# app with HIGHWAYSENSE_SYNC_URL=http://127.0.0.1:8765/potholes
+
+class SyncHandler(BaseHTTPRequestHandler):
+    sink = None
+    fail_rate = 0.0
+    # Handlers run on their own threads; one writer at a time keeps rows whole
+    write_lock = threading.Lock()
+
+    def do_POST(self):
+        if self.path != "/potholes":
+            self.send_error(404)
+            return
+        # Simulate a flaky uplink so the client retry path can be exercised
+        if random.random() < self.fail_rate:
+            self.send_error(503)
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            records = json.loads(self.rfile.read(length))
+        except ValueError:
+            self.send_error(400)
+            return
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            self.send_error(400)
+            return
+        with self.write_lock:
+            self.sink.write(records)
+        print(f"Stored {len(records)} pothole records")
+        self.send_response(204)
+        self.end_headers()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local pothole sync endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--csv", default="synced_pothole_data.csv")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    SyncHandler.sink = CsvSink(args.csv)
+    SyncHandler.fail_rate = args.fail_rate
+    server = ThreadingHTTPServer((args.host, args.port), SyncHandler)
+    print(f"Listening on http://{args.host}:{args.port}/potholes")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from collections import deque
+from itertools import count
+
+# Confirmation policy shared by every detection path: seen in CONFIRM_M of the
+# last CONFIRM_N frames with a mean confidence of at least MIN_CONFIDENCE
+CONFIRM_M = 3
+CONFIRM_N = 5
+MIN_CONFIDENCE = 0.7
+
+def iou(box_a, box_b):
+    ax, ay, aw, ah = box_a
+    bx, by, bw, bh = box_b
+    inter_w = min(ax + aw, bx + bw) - max(ax, bx)
+    inter_h = min(ay + ah, by + bh) - max(ay, by)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+class Track:
+    def __init__(self, track_id, box, score, window):
+        self.track_id = track_id
+        self.box = tuple(int(v) for v in box)
+        self.best_box = self.box
+        self.best_score = float(score)
+        self.hits = deque([float(score)], maxlen=window)
+        self.confirmed = False
+
+    def hit(self, box, score):
+        self.box = tuple(int(v) for v in box)
+        self.hits.append(float(score))
+        if score > self.best_score:
+            self.best_score = float(score)
+            self.best_box = self.box
+
+    def miss(self):
+        self.hits.append(0.0)
+
+    def evidence(self):
+        # (frames seen in the window, mean confidence over those frames)
+        seen = [s for s in self.hits if s > 0]
+        if not seen:
+            return 0, 0.0
+        return len(seen), sum(seen) / len(seen)
+
+
+class TemporalConfirmer:
+    """
+    Accumulates per-object evidence across frames before a pothole is committed.
+
+    Boxes are associated to tracks by IoU. A track is confirmed once it was seen
+    in at least m of the last n frames with a mean confidence of at least
+    min_confidence, and is reported exactly once so the caller writes a single
+    store row per pothole instead of one per frame.
+    """
+
+    def __init__(self, m=CONFIRM_M, n=CONFIRM_N, min_confidence=MIN_CONFIDENCE, iou_threshold=0.3):
+        self.m = m
+        self.n = n
+        self.min_confidence = min_confidence
+        self.iou_threshold = iou_threshold
+        self.tracks = []
+        self._ids = count(1)
+
+    def update(self, scores, boxes):
+        """
+        Feed one frame of detections and return the tracks confirmed by it.
+        """
+        detections = [(tuple(box), float(score)) for score, box in zip(_flat(scores), boxes)]
+
+        pairs = []
+        for t_idx, track in enumerate(self.tracks):
+            for d_idx, (box, _) in enumerate(detections):
+                overlap = iou(track.box, box)
+                if overlap >= self.iou_threshold:
+                    pairs.append((overlap, t_idx, d_idx))
+        pairs.sort(reverse=True)
+
+        matched_tracks, matched_dets = set(), set()
+        for _, t_idx, d_idx in pairs:
+            if t_idx in matched_tracks or d_idx in matched_dets:
+                continue
+            box, score = detections[d_idx]
+            self.tracks[t_idx].hit(box, score)
+            matched_tracks.add(t_idx)
+            matched_dets.add(d_idx)
+
+        for t_idx, track in enumerate(self.tracks):
+            if t_idx not in matched_tracks:
+                track.miss()
+
+        for d_idx, (box, score) in enumerate(detections):
+            if d_idx not in matched_dets:
+                self.tracks.append(Track(next(self._ids), box, score, self.n))
+
+        confirmed = []
+        for track in self.tracks:
+            if track.confirmed:
+                continue
+            seen, mean_score = track.evidence()
+            if seen >= self.m and mean_score >= self.min_confidence:
+                track.confirmed = True
+                confirmed.append(track)
+
+        # Forget objects that left the view for a whole window
+        self.tracks = [t for t in self.tracks if len(t.hits) < self.n or any(s > 0 for s in t.hits)]
+        return confirmed
+
+    def is_confirmed(self, box):
+        box = tuple(int(v) for v in box)
+        return any(t.confirmed and t.box == box for t in self.tracks)
+
+
+def _flat(scores):
+    # model.detect returns scores as (N,) or (N, 1) depending on the OpenCV version
+    return [float(s[0]) if hasattr(s, "__len__") else float(s) for s in scores]
@@ -0,0 +1,155 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import ingest
+from ingest import HttpSink, IngestQueue, PermanentSinkError, RetryLaterError, parse_retry_after
+
+
+class FakeSink:
+    def __init__(self, failures=()):
+        # One entry per call: an exception to raise, or None to accept the batch
+        self.failures = list(failures)
+        self.batches = []
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def write(self, records):
+        with self.lock:
+            self.calls += 1
+            if self.failures:
+                error = self.failures.pop(0)
+                if error is not None:
+                    raise error
+            self.batches.append(records)
+
+    @property
+    def records(self):
+        with self.lock:
+            return [r for batch in self.batches for r in batch]
+
+
+class DownSink:
+    def write(self, records):
+        raise ConnectionError("uplink down")
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def rows(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [json.loads(r) for (r,) in conn.execute(f"SELECT record FROM {table} ORDER BY id")]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+    monkeypatch.setattr(ingest, "ip_location", lambda: None)
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(sink, **kwargs):
+        kwargs.setdefault("db_path", str(tmp_path / "queue.db"))
+        kwargs.setdefault("flush_interval", 0.05)
+        kwargs.setdefault("max_backoff", 0.1)
+        q = IngestQueue(sink, **kwargs)
+        queues.append(q)
+        return q
+
+    yield make
+    for q in queues:
+        q.stop()
+    for q in queues:
+        q._thread.join(timeout=5)
+
+
+def test_connection_errors_are_retried_in_order(make_queue):
+    sink = FakeSink([ConnectionError("down"), ConnectionError("down")])
+    q = make_queue(sink, batch_size=2)
+    for i in range(5):
+        q.put("High", f"t{i}")
+
+    assert wait_until(lambda: len(sink.records) == 5)
+    assert [r["Timestamp"] for r in sink.records] == ["t0", "t1", "t2", "t3", "t4"]
+    assert sink.calls >= 3
+    assert q.rejected == 0
+    assert wait_until(lambda: rows(q.db_path, "pending") == [])
+
+
+def test_rejected_batch_is_dead_lettered_and_later_records_flush(make_queue, caplog):
+    sink = FakeSink([PermanentSinkError("400 Bad Request")])
+    q = make_queue(sink)
+    q.put("High", "bad")
+    assert wait_until(lambda: q.rejected == 1)
+
+    q.put("Low", "good")
+    assert wait_until(lambda: len(sink.records) == 1)
+    assert sink.records[0]["Timestamp"] == "good"
+    assert [r["Timestamp"] for r in rows(q.db_path, "dead_letter")] == ["bad"]
+    assert any("dead_letter" in r.getMessage() for r in caplog.records if r.levelno == logging.ERROR)
+
+
+def test_retry_later_is_not_dead_lettered(make_queue):
+    sink = FakeSink([RetryLaterError("429 Too Many Requests", retry_after=0.2)])
+    q = make_queue(sink)
+    q.put("High", "t0")
+
+    assert wait_until(lambda: len(sink.records) == 1)
+    assert q.rejected == 0
+    assert rows(q.db_path, "dead_letter") == []
+
+
+def test_max_pending_drops_oldest(make_queue, caplog):
+    q = make_queue(DownSink(), max_pending=3)
+    for i in range(5):
+        q.put("High", f"t{i}")
+
+    assert wait_until(lambda: q.dropped == 2)
+    assert [r["Timestamp"] for r in rows(q.db_path, "pending")] == ["t2", "t3", "t4"]
+    assert any("dropped" in r.getMessage() for r in caplog.records if r.levelno == logging.WARNING)
+
+
+def test_pending_rows_are_flushed_after_restart(make_queue, tmp_path):
+    db_path = str(tmp_path / "queue.db")
+    down = make_queue(DownSink(), db_path=db_path)
+    for i in range(3):
+        down.put("Medium", f"t{i}")
+    assert wait_until(lambda: len(rows(db_path, "pending")) == 3)
+    down.stop()
+    down._thread.join(timeout=5)
+
+    sink = FakeSink()
+    make_queue(sink, db_path=db_path)
+    assert wait_until(lambda: len(sink.records) == 3)
+    assert [r["Timestamp"] for r in sink.records] == ["t0", "t1", "t2"]
+
+
+@pytest.mark.parametrize("url", ["", "localhost:8765/potholes", "ftp://host/potholes", "http:///potholes"])
+def test_http_sink_rejects_bad_url(url):
+    with pytest.raises(ValueError):
+        HttpSink(url)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
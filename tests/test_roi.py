@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+import roi
+
+
+class FakeModel:
+    """
+    Stands in for detector.Detector: records what it was called with and
+    returns fixed boxes in crop coordinates.
+    """
+
+    def __init__(self, boxes, scores=None):
+        self.boxes = boxes
+        self.scores = scores if scores is not None else [0.9] * len(boxes)
+        self.calls = []
+
+    def detect(self, frame, conf_threshold, nms_threshold, size=(640, 480)):
+        self.calls.append((frame.shape, size))
+        return (np.zeros(len(self.boxes), dtype=np.int32),
+                np.array(self.scores, dtype=np.float32),
+                np.array(self.boxes, dtype=np.int32).reshape(-1, 4))
+
+
+@pytest.fixture
+def frame():
+    return np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+def test_full_frame_passes_boxes_through(frame):
+    model = FakeModel([(10, 20, 30, 40)])
+    classes, scores, boxes = roi.RoadROI().detect(model, frame, 0.5, 0.4)
+    assert model.calls == [((480, 640, 3), (640, 480))]
+    assert boxes.tolist() == [[10, 20, 30, 40]]
+
+
+def test_band_crop_shrinks_input_and_offsets_boxes(frame):
+    band = roi.RoadROI(horizon=0.5, hood=0.1)
+    model = FakeModel([(10, 20, 30, 40)])
+    _, _, boxes = band.detect(model, frame, 0.5, 0.4)
+    # Rows 240..432 are sent, at 40% of the base input height
+    assert model.calls == [((192, 640, 3), (640, 192))]
+    assert boxes.tolist() == [[10, 260, 30, 40]]
+
+
+def test_polygon_crop_drops_boxes_centred_off_road(frame):
+    # Trapezoid road: narrow at the horizon (y=240), full width at the bottom
+    road = roi.RoadROI(polygon=[[0.25, 0.5], [0.75, 0.5], [1.0, 1.0], [0.0, 1.0]])
+    # The crop is the polygon's bounding box, rows 240..480. The first box is
+    # centred on the road; the second sits in the crop's top-left corner, which
+    # is outside the trapezoid
+    model = FakeModel([(300, 100, 20, 20), (0, 0, 4, 4)], scores=[0.9, 0.8])
+    classes, scores, boxes = road.detect(model, frame, 0.5, 0.4)
+    assert model.calls[0][0] == (240, 640, 3)
+    assert boxes.tolist() == [[300, 340, 20, 20]]
+    assert scores.tolist() == pytest.approx([0.9])
+    assert len(classes) == 1
+
+
+def test_no_detections_returns_empty(frame):
+    _, _, boxes = roi.RoadROI(horizon=0.3).detect(FakeModel([]), frame, 0.5, 0.4)
+    assert len(boxes) == 0
+
+
+@pytest.mark.parametrize("config", [
+    dict(horizon=0.6, hood=0.4),
+    dict(horizon=-0.1),
+    dict(hood=1.0),
+    dict(polygon=[[0.0, 0.0], [1.0, 1.0]]),
+    dict(polygon=[[0.0, 0.0], [1.5, 0.5], [0.5, 1.0]]),
+    dict(horizon=0.5, polygon=[[0.0, 0.1], [1.0, 0.1], [0.5, 0.4]]),
+])
+def test_invalid_config_is_rejected(config):
+    with pytest.raises(ValueError):
+        roi.RoadROI(**config)
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "roi.json"
+    path.write_text(json.dumps({
+        "default": {"horizon": 0.0, "hood": 0.0, "polygon": None},
+        "dashcam_front": {"horizon": 0.35, "hood": 0.1, "polygon": None},
+        "0": "dashcam_front",
+    }))
+    monkeypatch.setattr(roi, "ROI_CONFIG_FILE", str(path))
+    return path
+
+
+def test_camera_index_alias_resolves_to_profile(config_file):
+    assert roi.load_roi(0).horizon == 0.35
+    assert roi.load_roi("dashcam_front").hood == 0.1
+
+
+def test_unknown_camera_falls_back_to_default(config_file):
+    assert roi.load_roi(3).horizon == 0.0
+
+
+def test_aliases_are_not_listed_as_profiles(config_file):
+    assert roi.list_profiles() == ["default", "dashcam_front"]
+
+
+def test_missing_config_means_full_frame(tmp_path, monkeypatch):
+    monkeypatch.setattr(roi, "ROI_CONFIG_FILE", str(tmp_path / "missing.json"))
+    assert roi.list_profiles() == []
+    assert roi.load_roi(0).bounds((480, 640)) == (0, 0, 640, 480)
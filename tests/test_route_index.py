@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+pytest.importorskip("shapely")
+pd = pytest.importorskip("pandas")
+
+import route_index
+
+# One east-west road along latitude 20 and one north-south road along longitude 76
+ROADS = {
+    "type": "FeatureCollection",
+    "features": [
+        {"type": "Feature", "geometry": {"type": "LineString",
+                                         "coordinates": [[75.0, 20.0], [75.5, 20.0], [76.0, 20.0]]}},
+        {"type": "Feature", "geometry": {"type": "MultiLineString",
+                                         "coordinates": [[[76.0, 19.5], [76.0, 20.5]]]}},
+    ],
+}
+METERS = 1 / route_index.METERS_PER_DEG_LAT
+
+
+@pytest.fixture
+def files(tmp_path):
+    roads = tmp_path / "roads.geojson"
+    roads.write_text(json.dumps(ROADS))
+    potholes = tmp_path / "pothole_data.csv"
+    pd.DataFrame({
+        "Latitude": [20.0 + 5 * METERS, 20.0 - 3 * METERS, 20.0 + 15 * METERS, 20.0 + 500 * METERS, "N/A"],
+        "Longitude": [75.8, 75.2, 75.5, 75.4, 75.3],
+        "Severity": ["High", "Low", "Medium", "High", "Low"],
+    }).to_csv(potholes, index=False)
+    return str(roads), str(potholes)
+
+
+def test_segments_are_split_from_lines_and_multilines(files):
+    segments = route_index.load_road_segments(files[0])
+    assert segments.shape == (3, 4)
+
+
+def test_rows_without_location_are_dropped(files):
+    assert len(route_index.load_potholes(files[1])) == 4
+
+
+def test_far_potholes_are_not_snapped(files):
+    index = route_index.RoadIndex(route_index.load_road_segments(files[0])).snap(
+        route_index.load_potholes(files[1]))
+    assert list(index.pothole_segment >= 0) == [True, True, True, False]
+
+
+def test_corridor_query_orders_by_distance_along_route(files):
+    index = route_index.get_index(*files)
+    result = index.potholes_along_route([(20.0, 75.0), (20.0, 76.0)], corridor_m=10)
+    # The pothole 15 m off the road and the one 500 m away fall outside the corridor
+    assert list(result["Longitude"]) == [75.2, 75.8]
+    assert result["Distance Along Route (m)"].is_monotonic_increasing
+    assert list(result["Distance From Route (m)"]) == pytest.approx([3.0, 5.0], abs=0.2)
+
+
+def test_route_away_from_potholes_finds_nothing(files):
+    index = route_index.get_index(*files)
+    assert index.potholes_along_route([(19.6, 76.0), (20.4, 76.0)], corridor_m=20).empty
+
+
+def test_appended_rows_are_snapped_without_a_rebuild(files):
+    roads, potholes = files
+    index = route_index.get_index(roads, potholes)
+    with open(potholes, "a") as f:
+        f.write(f"{20.0 + 2 * METERS},75.6,High\n")
+    assert route_index.get_index(roads, potholes) is index
+    result = index.potholes_along_route([(20.0, 75.0), (20.0, 76.0)], corridor_m=10)
+    assert list(result["Longitude"]) == [75.2, 75.6, 75.8]
+
+
+def test_rewritten_store_triggers_a_rebuild(files):
+    roads, potholes = files
+    index = route_index.get_index(roads, potholes)
+    pd.DataFrame({"Latitude": [20.0], "Longitude": [75.1]}).to_csv(potholes, index=False)
+    rebuilt = route_index.get_index(roads, potholes)
+    assert rebuilt is not index
+    assert len(rebuilt.potholes) == 1
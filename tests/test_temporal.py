@@ -0,0 +1,51 @@
+from temporal import TemporalConfirmer, iou
+
+
+def test_iou_of_disjoint_and_identical_boxes():
+    assert iou((0, 0, 10, 10), (20, 20, 10, 10)) == 0.0
+    assert iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+
+
+def test_one_frame_flicker_is_never_confirmed():
+    confirmer = TemporalConfirmer(m=3, n=5, min_confidence=0.7)
+    assert confirmer.update([0.95], [(100, 100, 40, 40)]) == []
+    for _ in range(10):
+        assert confirmer.update([], []) == []
+    # The track is forgotten once it has been missing for a whole window
+    assert confirmer.tracks == []
+
+
+def test_three_of_five_frames_confirms_exactly_once():
+    confirmer = TemporalConfirmer(m=3, n=5, min_confidence=0.7)
+    frames = [
+        ([0.8], [(100, 100, 40, 40)]),
+        ([], []),
+        ([0.9], [(102, 101, 40, 40)]),
+        ([0.75], [(104, 102, 40, 40)]),
+        ([0.8], [(106, 103, 40, 40)]),
+        ([0.85], [(108, 104, 40, 40)]),
+    ]
+    confirmed = [confirmer.update(scores, boxes) for scores, boxes in frames]
+    assert [len(c) for c in confirmed] == [0, 0, 0, 1, 0, 0]
+    track = confirmed[3][0]
+    assert track.best_score == 0.9
+    assert track.best_box == (102, 101, 40, 40)
+
+
+def test_low_mean_confidence_is_not_confirmed():
+    confirmer = TemporalConfirmer(m=3, n=5, min_confidence=0.7)
+    for _ in range(5):
+        assert confirmer.update([0.55], [(100, 100, 40, 40)]) == []
+
+
+def test_separate_objects_are_tracked_independently():
+    confirmer = TemporalConfirmer(m=2, n=3, min_confidence=0.5)
+    confirmer.update([0.9, 0.9], [(0, 0, 20, 20), (200, 200, 20, 20)])
+    confirmed = confirmer.update([0.9, 0.9], [(1, 1, 20, 20), (201, 201, 20, 20)])
+    assert sorted(t.track_id for t in confirmed) == [1, 2]
+
+
+def test_scores_in_column_layout_are_accepted():
+    # Older OpenCV builds return scores with shape (N, 1)
+    confirmer = TemporalConfirmer(m=1, n=1, min_confidence=0.5)
+    assert len(confirmer.update([[0.9]], [(0, 0, 10, 10)])) == 1